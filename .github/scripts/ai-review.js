@@ -1,7 +1,9 @@
 const axios = require('axios');
-const { execSync } = require('child_process');
+const { spawn } = require('child_process');
 const github = require('@actions/github');
 const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
 const parseDiff = require('parse-diff');
 const similarity = require('string-similarity');
 const Parser = require('tree-sitter');
@@ -18,6 +20,8 @@ const GITHUB_TOKEN = process.env.GITHUB_TOKEN;
 const GITHUB_REPOSITORY = process.env.GITHUB_REPOSITORY;
 
 const AI_MODEL = process.env.AI_MODEL || 'gemini';
+const AI_REVIEW_CACHE_DIR = process.env.AI_REVIEW_CACHE_DIR || '.ai-review-cache';
+const AI_REVIEW_NO_CACHE = process.env.AI_REVIEW_NO_CACHE === '1';
 
 const AZURE_CONFIG = {
     key: process.env.AZURE_OPENAI_KEY,
@@ -93,6 +97,35 @@ const LANGUAGE_CONFIG = {
 
 // --- Utility & Chunking Functions ---
 
+/**
+ * Runs a git command without a shell and collects its stdout from the stream.
+ * Chunks are kept as Buffers and decoded once, so large diffs are not limited by a child_process maxBuffer.
+ * @param {string[]} args The arguments to pass to git.
+ * @returns {Promise<string>} The command's stdout decoded as UTF-8.
+ */
+async function runGit(args) {
+    const child = spawn('git', args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const stderrChunks = [];
+    child.stderr.on('data', chunk => stderrChunks.push(chunk));
+    const exitCode = new Promise((resolve, reject) => {
+        child.on('error', reject);
+        child.on('close', resolve);
+    });
+
+    const readStdout = (async () => {
+        const chunks = [];
+        for await (const chunk of child.stdout) chunks.push(chunk);
+        return chunks;
+    })();
+
+    // Await both together so a spawn failure rejects this call instead of going unhandled.
+    const [stdoutChunks, code] = await Promise.all([readStdout, exitCode]);
+    if (code !== 0) {
+        throw new Error(`git ${args.join(' ')} exited with code ${code}: ${Buffer.concat(stderrChunks).toString('utf-8').trim()}`);
+    }
+    return Buffer.concat(stdoutChunks).toString('utf-8');
+}
+
 /**
  * Estimates the number of tokens for a given text based on a simple character count heuristic.
  * @param {string} text The input text to estimate tokens for.
@@ -111,8 +144,53 @@ function normalizeLine(line) {
     return line.trim().replace(/^[\s+-]/, '').replace(/\s+/g, ' ');
 }
 
+const diffIndexCache = { diffText: null, files: new Map() };
+
+/**
+ * Returns the chunks of a file in the diff with each change line normalized once.
+ * The parsed diff is memoized per diff text, so matching many issues does not re-parse or re-normalize it.
+ * @param {string} diffText The entire git diff.
+ * @param {string} filePath The path of the file to look up.
+ * @returns {{changes: object[], normalized: string[], lineIndex: Map<string, number[]>}[]|null} The indexed chunks or null if the file is not in the diff.
+ */
+function getIndexedDiffFile(diffText, filePath) {
+    if (diffIndexCache.diffText !== diffText) {
+        diffIndexCache.diffText = diffText;
+        diffIndexCache.files = new Map();
+        for (const file of parseDiff(diffText)) {
+            const chunks = file.chunks.map(chunk => {
+                const normalized = chunk.changes.map(c => normalizeLine(c.content));
+                const lineIndex = new Map();
+                normalized.forEach((line, i) => {
+                    if (!lineIndex.has(line)) lineIndex.set(line, []);
+                    lineIndex.get(line).push(i);
+                });
+                return { changes: chunk.changes, normalized, lineIndex };
+            });
+            for (const key of [file.to, file.from]) {
+                if (key && !diffIndexCache.files.has(key)) diffIndexCache.files.set(key, chunks);
+            }
+        }
+    }
+    return diffIndexCache.files.get(filePath) || null;
+}
+
+/**
+ * Converts a matched window of diff changes into the line range to comment on.
+ * @param {object[]} window The matched slice of `parse-diff` changes.
+ * @returns {{start: number, end: number}|null} The start and end line numbers, or null if the window has no added lines.
+ */
+function windowToLocation(window) {
+    const firstAddedChange = window.find(c => c.add);
+    if (!firstAddedChange) return null;
+    const lastChange = window[window.length - 1];
+    // A normal change has both, an add has only 'ln', a delete has only 'ln2'
+    const endLine = lastChange.add ? lastChange.ln : (lastChange.del ? lastChange.ln2 : lastChange.ln);
+    return { start: firstAddedChange.ln, end: endLine || firstAddedChange.ln };
+}
+
 /**
- * Finds the location of a code snippet within a diff using fuzzy matching.
+ * Finds the location of a code snippet within a diff, trying an exact line-indexed match before fuzzy matching.
  * @param {string} diffText The entire git diff.
  * @param {string} filePath The path of the file to search within.
  * @param {string} codeSnippet The code snippet provided by the AI.
@@ -120,9 +198,8 @@ function normalizeLine(line) {
  */
 function matchSnippetFromDiff(diffText, filePath, codeSnippet) {
     const SIMILARITY_THRESHOLD = 0.85;
-    const parsedFiles = parseDiff(diffText);
-    const targetFile = parsedFiles.find(file => file.to === filePath || file.from === filePath);
-    if (!targetFile) return null;
+    const targetChunks = getIndexedDiffFile(diffText, filePath);
+    if (!targetChunks) return null;
 
     if (!codeSnippet || typeof codeSnippet !== 'string') {
         console.warn(`Invalid code snippet provided for file: ${filePath}`);
@@ -133,21 +210,31 @@ function matchSnippetFromDiff(diffText, filePath, codeSnippet) {
     const normalizedSnippetLines = snippetLines.map(normalizeLine);
     if (normalizedSnippetLines.length === 0 || normalizedSnippetLines.every(l => l === '')) return null;
 
-    // FIX: The missing line is added here.
     const snippetText = normalizedSnippetLines.join('\n');
+    const windowSize = snippetLines.length;
+
+    // Exact match: only windows starting at an occurrence of the first snippet line are candidates.
+    for (const chunk of targetChunks) {
+        for (const i of chunk.lineIndex.get(normalizedSnippetLines[0]) || []) {
+            if (i + windowSize > chunk.normalized.length) break;
+            if (normalizedSnippetLines.every((line, j) => chunk.normalized[i + j] === line)) {
+                const location = windowToLocation(chunk.changes.slice(i, i + windowSize));
+                if (location) {
+                    console.log(`✅ Found exact match for snippet in ${filePath}`);
+                    return location;
+                }
+            }
+        }
+    }
 
-    for (const chunk of targetFile.chunks) {
-        for (let i = 0; i <= chunk.changes.length - snippetLines.length; i++) {
-            const window = chunk.changes.slice(i, i + snippetLines.length);
-            const windowText = window.map(c => normalizeLine(c.content)).join('\n');
+    for (const chunk of targetChunks) {
+        for (let i = 0; i <= chunk.changes.length - windowSize; i++) {
+            const windowText = chunk.normalized.slice(i, i + windowSize).join('\n');
             if (similarity.compareTwoStrings(snippetText, windowText) >= SIMILARITY_THRESHOLD) {
-                console.log(`✅ Found fuzzy match for snippet in ${filePath}`);
-                const firstAddedChange = window.find(c => c.add);
-                if (firstAddedChange) {
-                    const lastChange = window[window.length - 1];
-                    // A normal change has both, an add has only 'ln', a delete has only 'ln2'
-                    const endLine = lastChange.add ? lastChange.ln : (lastChange.del ? lastChange.ln2 : lastChange.ln);
-                    return { start: firstAddedChange.ln, end: endLine || firstAddedChange.ln };
+                const location = windowToLocation(chunk.changes.slice(i, i + windowSize));
+                if (location) {
+                    console.log(`✅ Found fuzzy match for snippet in ${filePath}`);
+                    return location;
                 }
             }
         }
@@ -166,9 +253,9 @@ function matchSnippetFromDiff(diffText, filePath, codeSnippet) {
  * @param {object} parsedFile The file object from `parse-diff`.
  * @param {number} promptTokens The token count of the base prompt.
  * @param {number} tokenLimit The AI model's token limit.
- * @returns {object[]|null} An array of function-based chunks or null if parsing fails or is not supported.
+ * @returns {Promise<object[]|null>} An array of function-based chunks or null if parsing fails or is not supported.
  */
-function chunkByFunction(filePath, parsedFile, promptTokens, tokenLimit) {
+async function chunkByFunction(filePath, parsedFile, promptTokens, tokenLimit) {
     const fileExtension = '.' + filePath.split('.').pop();
     const lang = Object.keys(LANGUAGE_CONFIG).find(key => LANGUAGE_CONFIG[key].extensions.includes(fileExtension));
 
@@ -179,7 +266,7 @@ function chunkByFunction(filePath, parsedFile, promptTokens, tokenLimit) {
 
     const config = LANGUAGE_CONFIG[lang];
     try {
-        const sourceCode = execSync(`git show HEAD:${filePath}`, { encoding: 'utf-8' }).toString();
+        const sourceCode = await runGit(['show', `HEAD:${filePath}`]);
         const parser = new Parser();
         
         let languageModule;
@@ -355,6 +442,35 @@ function buildFunctionReviewPrompt(functionCode) {
 
 // --- AI & GitHub Interaction ---
 
+/**
+ * Builds the HTTP request for the given model. The JSON body is serialized once into a Buffer
+ * so retries reuse it and axios does not stringify the (potentially large) prompt again.
+ * @param {string} modelName The name of the model to use ('azure' or 'gemini').
+ * @param {string} prompt The complete prompt to send to the model.
+ * @param {number} maxOutputTokens The maximum number of tokens the model may generate.
+ * @returns {{url: string, body: Buffer, headers: object, extract: function(object): (string|undefined)}} The request description.
+ */
+function buildModelRequest(modelName, prompt, maxOutputTokens) {
+    let url, payload, headers, extract;
+    if (modelName === 'azure') {
+        const { endpoint, deployment, key } = AZURE_CONFIG;
+        url = `${endpoint}/openai/deployments/${deployment}/chat/completions?api-version=${API_VERSION_AZURE}`;
+        payload = { messages: [{ role: "system", content: "You are a professional code reviewer." }, { role: "user", content: prompt }], temperature: 0.3, max_tokens: maxOutputTokens };
+        headers = { 'api-key': key };
+        extract = data => data.choices?.[0]?.message?.content?.trim();
+    } else if (modelName === 'gemini') {
+        const { endpoint, key } = GEMINI_CONFIG;
+        url = `${endpoint}?key=${key}`;
+        payload = { contents: [{ role: 'user', parts: [{ text: prompt }] }], generationConfig: { temperature: 0.1, topP: 0.9, maxOutputTokens } };
+        headers = {};
+        extract = data => data.candidates?.[0]?.content?.parts?.[0]?.text?.trim();
+    } else {
+        throw new Error(`Unsupported AI model: ${modelName}`);
+    }
+    const body = Buffer.from(JSON.stringify(payload), 'utf-8');
+    return { url, body, headers: { ...headers, 'Content-Type': 'application/json', 'Content-Length': body.length }, extract };
+}
+
 /**
  * Calls the specified AI model with a prompt and handles retries.
  * @param {string} modelName The name of the model to use ('azure' or 'gemini').
@@ -365,28 +481,17 @@ function buildFunctionReviewPrompt(functionCode) {
 async function callAIModel(modelName, prompt, promptTokens) {
     console.log(`Using ${modelName.toUpperCase()} model...`);
     const availableOutputTokens = Math.max(1024, TOKEN_LIMIT - promptTokens - 500);
+    const request = buildModelRequest(modelName, prompt, availableOutputTokens);
     let lastError = null;
 
     for (let attempt = 1; attempt <= MAX_RETRIES; attempt++) {
         try {
-            let res;
-            if (modelName === 'azure') {
-                const { endpoint, deployment, key } = AZURE_CONFIG;
-                res = await axios.post(`${endpoint}/openai/deployments/${deployment}/chat/completions?api-version=${API_VERSION_AZURE}`,
-                    { messages: [{ role: "system", content: "You are a professional code reviewer." }, { role: "user", content: prompt }], temperature: 0.3, max_tokens: availableOutputTokens },
-                    { headers: { 'api-key': key, 'Content-Type': 'application/json' } }
-                );
-                return res.data.choices?.[0]?.message?.content?.trim();
-            } else if (modelName === 'gemini') {
-                const { endpoint, key } = GEMINI_CONFIG;
-                res = await axios.post(`${endpoint}?key=${key}`,
-                    { contents: [{ role: 'user', parts: [{ text: prompt }] }], generationConfig: { temperature: 0.1, topP: 0.9, maxOutputTokens: availableOutputTokens } },
-                    { headers: { 'Content-Type': 'application/json' } }
-                );
-                return res.data.candidates?.[0]?.content?.parts?.[0]?.text?.trim();
-            } else {
-                throw new Error(`Unsupported AI model: ${modelName}`);
-            }
+            const res = await axios.post(request.url, request.body, {
+                headers: request.headers,
+                maxBodyLength: Infinity,
+                maxContentLength: Infinity,
+            });
+            return request.extract(res.data);
         } catch (error) {
             lastError = error;
             console.error(`Attempt ${attempt} failed for ${modelName} model:`, error.message);
@@ -405,11 +510,83 @@ async function callAIModel(modelName, prompt, promptTokens) {
     throw new Error(`Failed to get response from ${modelName} AI model after ${MAX_RETRIES} attempts.`);
 }
 
+/**
+ * Returns the path of the cache file for a model/prompt pair.
+ * @param {string} modelName The name of the model.
+ * @param {string} prompt The complete prompt.
+ * @returns {string} The cache file path.
+ */
+function getReviewCachePath(modelName, prompt) {
+    const key = crypto.createHash('sha256').update(`${modelName}|${prompt}`).digest('hex');
+    return path.join(AI_REVIEW_CACHE_DIR, `${key}.json`);
+}
+
+/**
+ * Parses a raw AI review response into an object, stripping any Markdown code fences.
+ * @param {string} reviewRaw The raw response text from the AI model.
+ * @returns {object} The parsed review.
+ * @throws {SyntaxError} If the response is not valid JSON.
+ */
+function parseReviewResponse(reviewRaw) {
+    return JSON.parse(reviewRaw.replace(/```json|```/g, "").trim());
+}
+
+/**
+ * Calls the AI model, reusing a previously stored response when the same prompt was already reviewed.
+ * Only responses that pass `isValid` are cached, so a malformed response is retried on the next run.
+ * Set AI_REVIEW_NO_CACHE=1 to always call the model.
+ * @param {string} modelName The name of the model to use ('azure' or 'gemini').
+ * @param {string} prompt The complete prompt to send to the model.
+ * @param {number} promptTokens The estimated token count of the prompt.
+ * @param {function(string): boolean} isValid Returns whether a response is usable and may be cached.
+ * @returns {Promise<string|undefined>} The AI's response as a string.
+ */
+async function callAIModelCached(modelName, prompt, promptTokens, isValid) {
+    if (AI_REVIEW_NO_CACHE) return callAIModel(modelName, prompt, promptTokens);
+
+    const cachePath = getReviewCachePath(modelName, prompt);
+    try {
+        const cached = JSON.parse(fs.readFileSync(cachePath, 'utf8'));
+        if (typeof cached.review === 'string' && isValid(cached.review)) {
+            console.log(`Using cached ${modelName.toUpperCase()} response (${path.basename(cachePath)}).`);
+            return cached.review;
+        }
+    } catch (error) {
+        if (error.code !== 'ENOENT') console.warn(`Ignoring unreadable review cache entry ${cachePath}:`, error.message);
+    }
+
+    const review = await callAIModel(modelName, prompt, promptTokens);
+    if (review && isValid(review)) {
+        try {
+            fs.mkdirSync(AI_REVIEW_CACHE_DIR, { recursive: true });
+            fs.writeFileSync(cachePath, JSON.stringify({ model: modelName, review }));
+        } catch (error) {
+            console.warn(`Failed to write review cache entry ${cachePath}:`, error.message);
+        }
+    }
+    return review;
+}
+
+/**
+ * Returns whether a raw AI review response parses as JSON.
+ * @param {string} reviewRaw The raw response text from the AI model.
+ * @returns {boolean} True if the response can be parsed.
+ */
+function isParsableReview(reviewRaw) {
+    try {
+        parseReviewResponse(reviewRaw);
+        return true;
+    } catch (e) {
+        return false;
+    }
+}
+
 /**
  * Gets the git diff for the current pull request context.
- * @returns {{diff: string, changedFiles: string[]}} An object containing the full diff and a list of changed file paths.
+ * The full diff and the changed file list only depend on local refs, so they are read concurrently.
+ * @returns {Promise<{diff: string, changedFiles: string[]}>} An object containing the full diff and a list of changed file paths.
  */
-function getGitDiff() {
+async function getGitDiff() {
     try {
         if (!GITHUB_BASE_REF) {
             console.log("Not a pull request context. Skipping AI review.");
@@ -423,9 +600,12 @@ function getGitDiff() {
         }
 
         console.log(`Fetching base branch ${GITHUB_BASE_REF} for diff...`);
-        execSync(`git fetch origin ${GITHUB_BASE_REF}`, { stdio: 'inherit' });
-        const fullDiff = execSync(`git diff origin/${GITHUB_BASE_REF}...HEAD`, { encoding: 'utf-8' }).toString();
-        const changedFiles = execSync(`git diff --name-only origin/${GITHUB_BASE_REF}...HEAD`, { encoding: 'utf-8' }).split('\n').filter(Boolean);
+        await runGit(['fetch', 'origin', GITHUB_BASE_REF]);
+        const [fullDiff, nameOnly] = await Promise.all([
+            runGit(['diff', `origin/${GITHUB_BASE_REF}...HEAD`]),
+            runGit(['diff', '--name-only', `origin/${GITHUB_BASE_REF}...HEAD`]),
+        ]);
+        const changedFiles = nameOnly.split('\n').filter(Boolean);
         if (!fullDiff.trim()) {
             console.log("No changes detected. Skipping AI review.");
             process.exit(0);
@@ -553,7 +733,7 @@ async function postIssueComments(octokit, owner, repo, prNumber, commitId, issue
  * @returns {Promise<void>}
  */
 async function reviewCode() {
-    const { diff: fullDiff, changedFiles } = getGitDiff();
+    const { diff: fullDiff, changedFiles } = await getGitDiff();
     const fileChunks = splitDiffByFileChunks(fullDiff);
 
     const allIssues = [], allHighlights = new Set(), overallSummaries = [];
@@ -570,7 +750,7 @@ async function reviewCode() {
         if (promptTokensForChunking + diffTokens > TOKEN_LIMIT) {
             console.log(`   - ❗ File diff is large (${diffTokens} tokens), attempting to split by function (Level 2)...`);
             promptTokensForChunking = baseFunctionPromptTokens;
-            chunksToProcess = chunkByFunction(filePath, parsedFile, promptTokensForChunking, TOKEN_LIMIT);
+            chunksToProcess = await chunkByFunction(filePath, parsedFile, promptTokensForChunking, TOKEN_LIMIT);
             if (chunksToProcess && chunksToProcess.length > 0) {
                 console.log(`   - ✅ Successfully split into ${chunksToProcess.length} function-based chunks.`);
             } else {
@@ -591,12 +771,12 @@ async function reviewCode() {
             
             let reviewRaw;
             try {
-                reviewRaw = await callAIModel(AI_MODEL, prompt, promptTokens);
+                reviewRaw = await callAIModelCached(AI_MODEL, prompt, promptTokens, isParsableReview);
             } catch (error) { continue; }
             if (!reviewRaw) { console.error(`Received empty response from AI for ${chunk.filePath}.`); continue; }
 
             try {
-                const parsedReview = JSON.parse(reviewRaw.replace(/```json|```/g, "").trim());
+                const parsedReview = parseReviewResponse(reviewRaw);
                 if (parsedReview.overall_summary && index === 0) overallSummaries.push(parsedReview.overall_summary);
                 if (parsedReview.highlights) parsedReview.highlights.forEach(h => allHighlights.add(h));
                 if (parsedReview.issues?.length) {
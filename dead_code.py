@@ -1,74 +1,162 @@
+import functools
+import itertools
+import logging
+import math
+import mmap
+import operator
 import os
+import stat
+import threading
 from typing import Callable, Optional, Union
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; get_prime_numbers uses a bytearray sieve instead
+    np = None
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; fall back to plain Python
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
 
 # === Core Functionalities ===
 
 def process(data: Union[str, int, float], mode: str = 'default') -> Optional[str]:
     """Process data with various modes and return uppercase result."""
-    print("Processing started...")
+    logger.debug("Processing started...")
     try:
         data = str(data)
         if mode == 'debug':
-            print("Debug mode: Input data =", data)
+            logger.debug("Debug mode: Input data = %s", data)
         elif mode == 'verbose':
-            print(f"Verbose mode: Data length = {len(data)}")
+            logger.debug("Verbose mode: Data length = %d", len(data))
         elif mode == 'reverse':
             data = data[::-1]
-            print("Reversed data:", data)
+            logger.debug("Reversed data: %s", data)
         elif mode == 'lower':
             data = data.lower()
-            print("Lowercase data:", data)
+            logger.debug("Lowercase data: %s", data)
 
         result = data.upper()
-        print("Processed result:", result)
+        logger.debug("Processed result: %s", result)
         return result
     except Exception as e:
-        print("Error during processing:", e)
+        logger.error("Error during processing: %s", e)
         return None
 
 
+_OPERATIONS: dict[str, Callable[[float, float], float]] = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': operator.truediv,
+    'modulus': operator.mod,
+    'power': operator.pow,
+}
+
+
 def calculate(x: float, y: float, operation: str = 'subtract', round_result: bool = False) -> Optional[float]:
     """Perform basic arithmetic operations with optional rounding."""
+    func = _OPERATIONS.get(operation)
+    if func is None:
+        logger.warning("Unsupported operation: %s", operation)
+        return None
     try:
-        result = {
-            'add': x + y,
-            'subtract': x - y,
-            'multiply': x * y,
-            'divide': x / y,
-            'modulus': x % y,
-            'power': x ** y
-        }.get(operation)
-
-        if result is None:
-            print(f"Unsupported operation: {operation}")
-            return None
+        result = func(x, y)
         return round(result, 2) if round_result else result
     except ZeroDivisionError:
-        print("Cannot divide by zero.")
+        logger.warning("Cannot divide by zero.")
         return None
     except Exception as e:
-        print("Error during calculation:", e)
+        logger.error("Error during calculation: %s", e)
         return None
 
 
 # === File Operations ===
 
+# Files at least this large are memory-mapped instead of read into a bytes buffer.
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Read a file of the given fstat size, normally with a single read syscall."""
+    data = os.read(fd, size)
+    if size and len(data) == size:
+        return data
+    # Short read, or a file whose size fstat cannot report (e.g. procfs): drain to EOF.
+    chunks = [data]
+    while chunk := os.read(fd, 1 << 16):
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _decode_fd(fd: int, encoding: str) -> str:
+    """Decode a file's contents, mapping large files rather than copying them through a read buffer."""
+    size = os.fstat(fd).st_size
+    if size < _MMAP_THRESHOLD:
+        return _read_fd(fd, size).decode(encoding)
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return str(mm, encoding)
+
+
 def read_file(filepath: str, verbose: bool = False, encoding: str = 'utf-8') -> Optional[str]:
     """Read file contents with optional verbosity."""
-    if not os.path.exists(filepath):
-        print("File does not exist:", filepath)
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except FileNotFoundError:
+        logger.warning("File does not exist: %s", filepath)
+        return None
+    except OSError as e:
+        logger.error("Error reading file: %s - %s", filepath, e)
         return None
     try:
-        with open(filepath, 'r', encoding=encoding) as f:
-            content = f.read()
-            if verbose:
-                print(f"Reading file: {filepath}")
-                print(f"Line count: {len(content.splitlines())}")
-            return content
-    except (FileNotFoundError, IOError) as e:
-        print("Error reading file:", filepath, "-", str(e))
+        content = _decode_fd(fd, encoding)
+    except OSError as e:
+        logger.error("Error reading file: %s - %s", filepath, e)
         return None
+    finally:
+        os.close(fd)
+    if verbose:
+        logger.debug("Reading file: %s", filepath)
+        line_count = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+        logger.debug("Line count: %d", line_count)
+    return content
+
+
+def read_file_view(filepath: str) -> Optional[memoryview]:
+    """Map a file read-only and return a zero-copy view of its bytes.
+
+    The mapping stays alive until the returned view is released.
+    """
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except FileNotFoundError:
+        logger.warning("File does not exist: %s", filepath)
+        return None
+    except OSError as e:
+        logger.error("Error reading file: %s - %s", filepath, e)
+        return None
+    try:
+        if os.fstat(fd).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError) as e:
+        logger.error("Error reading file: %s - %s", filepath, e)
+        return None
+    finally:
+        os.close(fd)
 
 
 def write_file(filepath: str, content: str, encoding: str = 'utf-8') -> bool:
@@ -76,30 +164,35 @@ def write_file(filepath: str, content: str, encoding: str = 'utf-8') -> bool:
     try:
         with open(filepath, 'w', encoding=encoding) as f:
             f.write(content)
-        print(f"Content written to {filepath}")
+        logger.debug("Content written to %s", filepath)
         return True
     except IOError as e:
-        print("Failed to write file:", filepath, "-", str(e))
+        logger.error("Failed to write file: %s - %s", filepath, e)
         return False
 
 
 def get_file_size(filepath: str) -> int:
     """Return file size in bytes, or -1 if not found."""
-    if os.path.isfile(filepath):
-        size = os.path.getsize(filepath)
-        print(f"File size of {filepath}: {size} bytes")
-        return size
-    print("File not found:", filepath)
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        st = None
+    if st is not None and stat.S_ISREG(st.st_mode):
+        logger.debug("File size of %s: %d bytes", filepath, st.st_size)
+        return st.st_size
+    logger.warning("File not found: %s", filepath)
     return -1
 
 
 def list_files(directory: str) -> list[str]:
     """List files in a given directory."""
-    print(f"Listing files in directory: {directory}")
-    if not os.path.isdir(directory):
-        print("Not a valid directory.")
+    logger.debug("Listing files in directory: %s", directory)
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries]
+    except (FileNotFoundError, NotADirectoryError):
+        logger.warning("Not a valid directory: %s", directory)
         return []
-    return os.listdir(directory)
 
 
 # === String Utilities ===
@@ -107,75 +200,168 @@ def list_files(directory: str) -> list[str]:
 def count_words(text: str) -> int:
     """Count the number of words in a string."""
     if not isinstance(text, str):
-        print("Invalid input. Expected string.")
+        logger.warning("Invalid input. Expected string.")
         return 0
-    words = text.strip().split()
-    print(f"Word count: {len(words)}")
-    return len(words)
+    word_count = len(text.split())
+    logger.debug("Word count: %d", word_count)
+    return word_count
+
+
+# Size of the slices count_words_in_buffer copies out of the buffer at a time.
+_WORD_SCAN_CHUNK = 1 << 16
+
+
+def count_words_in_buffer(buf: Union[bytes, bytearray, memoryview]) -> int:
+    """Count whitespace-separated words in a bytes-like buffer, e.g. one from read_file_view.
+
+    The buffer is scanned in fixed-size slices, so memory use stays bounded
+    whatever the buffer size.
+    """
+    view = memoryview(buf).cast('B')
+    count = 0
+    prev_in_word = False
+    for start in range(0, len(view), _WORD_SCAN_CHUNK):
+        chunk = bytes(view[start:start + _WORD_SCAN_CHUNK])
+        count += len(chunk.split())
+        # A word running across the slice boundary was counted in both slices.
+        if prev_in_word and not chunk[:1].isspace():
+            count -= 1
+        prev_in_word = not chunk[-1:].isspace()
+    return count
 
 
 def compare_strings(a: str, b: str, case_sensitive: bool = False) -> bool:
     """Compare two strings with optional case sensitivity."""
-    if not case_sensitive:
-        a, b = a.lower(), b.lower()
-    result = a == b
-    print("Strings are equal." if result else "Strings are different.")
+    if case_sensitive:
+        result = a == b
+    elif a.isascii() and b.isascii() and len(a) != len(b):
+        # ASCII case mapping preserves length, so no lowered copies are needed to tell these apart.
+        result = False
+    else:
+        result = a.lower() == b.lower()
+    logger.debug("Strings are %s.", "equal" if result else "different")
     return result
 
 
 def reverse_words(text: str) -> str:
     """Reverse the order of words in a string."""
     if not isinstance(text, str):
-        print("Expected a string input.")
+        logger.warning("Expected a string input.")
         return ""
-    reversed_text = ' '.join(reversed(text.strip().split()))
-    print("Reversed word order:", reversed_text)
+    reversed_text = ' '.join(text.split()[::-1])
+    logger.debug("Reversed word order: %s", reversed_text)
     return reversed_text
 
 
 # === Math and Logic ===
 
-def is_prime(n: int) -> bool:
-    """Check if a number is prime."""
-    if n <= 1:
+def _trial_division(n: int) -> bool:
+    """Trial-division primality test shared by the Python and numba paths."""
+    if n <= 3:
+        return n > 1
+    if n % 2 == 0:
         return False
-    for i in range(2, int(n**0.5) + 1):
+    for i in range(3, int(n**0.5) + 1, 2):
         if n % i == 0:
             return False
     return True
 
 
+_trial_division_jit = njit(cache=True)(_trial_division)
+
+# numba compiles for machine integers only; anything outside int64 stays in Python.
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+
+@functools.lru_cache(maxsize=4096)
+def is_prime(n: int) -> bool:
+    """Check if a number is prime."""
+    if _INT64_MIN <= n <= _INT64_MAX:
+        return _trial_division_jit(n)
+    return _trial_division(n)
+
+
+if _HAS_NUMBA:
+    # Compile (or load from numba's on-disk cache) at import instead of on the first call.
+    _trial_division_jit(3)
+
+
+_FIBONACCI: list[int] = [0, 1]
+_FIBONACCI_LOCK = threading.Lock()
+
+
 def generate_fibonacci(n: int) -> list[int]:
-    """Generate first n Fibonacci numbers."""
+    """Generate first n Fibonacci numbers, extending a shared prefix only as far as needed."""
     if n <= 0:
         return []
-    fib = [0, 1]
-    while len(fib) < n:
-        fib.append(fib[-1] + fib[-2])
+    fib = _FIBONACCI
+    if len(fib) < n:
+        # The prefix is only ever appended to, and only under the lock, so readers can slice it freely.
+        with _FIBONACCI_LOCK:
+            append = fib.append
+            a, b = fib[-2], fib[-1]
+            for _ in range(n - len(fib)):
+                a, b = b, a + b
+                append(b)
     return fib[:n]
 
 
+def _fibonacci_pair(n: int) -> tuple[int, int]:
+    """Return (F(n), F(n + 1)) using the fast-doubling identities."""
+    if n == 0:
+        return 0, 1
+    a, b = _fibonacci_pair(n >> 1)
+    c = a * ((b << 1) - a)
+    d = a * a + b * b
+    return (d, c + d) if n & 1 else (c, d)
+
+
+def fibonacci(n: int) -> Optional[int]:
+    """Return the n-th Fibonacci number (F(0) = 0) in O(log n) arithmetic steps."""
+    if n < 0:
+        logger.warning("Fibonacci index must be non-negative, got %d", n)
+        return None
+    return _fibonacci_pair(n)[0]
+
+
 def get_prime_numbers(limit: int) -> list[int]:
-    """Get all prime numbers below a given limit."""
-    return [x for x in range(2, limit) if is_prime(x)]
+    """Get all prime numbers below a given limit using a Sieve of Eratosthenes."""
+    if limit < 2:
+        return []
+    # Even numbers are cleared up front, so only odd multiples of odd primes need striking.
+    if np is not None:
+        sieve = np.ones(limit, dtype=bool)
+        sieve[:2] = False
+        sieve[4::2] = False
+        for i in range(3, math.isqrt(limit - 1) + 1, 2):
+            if sieve[i]:
+                sieve[i*i::2*i] = False
+        return np.flatnonzero(sieve).tolist()
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    sieve[4::2] = bytes(len(range(4, limit, 2)))
+    for i in range(3, math.isqrt(limit - 1) + 1, 2):
+        if sieve[i]:
+            sieve[i*i::2*i] = bytes(len(range(i*i, limit, 2*i)))
+    return list(itertools.compress(range(limit), sieve))
 
 
 def safe_divide(a: float, b: float, fallback: float = 0.0) -> float:
     """Safely divide two numbers with fallback on division by zero."""
-    try:
-        return a / b
-    except ZeroDivisionError:
-        print("Divide by zero encountered. Returning fallback value.")
+    if not b:
+        logger.warning("Divide by zero encountered. Returning fallback value.")
         return fallback
+    return a / b
 
 
 def merge_dicts(dict1: dict, dict2: dict) -> dict:
     """Merge two dictionaries."""
     if not isinstance(dict1, dict) or not isinstance(dict2, dict):
-        print("Both inputs should be dictionaries.")
+        logger.warning("Both inputs should be dictionaries.")
         return {}
-    merged = {**dict1, **dict2}
-    print("Merged dictionary:", merged)
+    merged = dict(dict1)
+    merged.update(dict2)
+    logger.debug("Merged dictionary: %s", merged)
     return merged
 
 
@@ -183,15 +369,18 @@ def merge_dicts(dict1: dict, dict2: dict) -> dict:
 
 def do_work(factor: int = 42, count: int = 10, callback: Optional[Callable[[int, int], int]] = None) -> int:
     """Perform a repeated task with optional callback logic."""
+    logger.debug("Doing work with factor = %s and count = %s", factor, count)
+    if callback is None:
+        # Sum of i * factor for i in range(count), in closed form.
+        n = max(count, 0)
+        result = factor * (n * (n - 1) // 2)
+        logger.debug("Final result: %s", result)
+        return result
     result = 0
-    print(f"Doing work with factor = {factor} and count = {count}")
     for i in range(count):
-        partial = i * factor
-        if callback:
-            partial = callback(partial, i)
-        result += partial
-        print(f"Step {i}: intermediate result = {result}")
-    print("Final result:", result)
+        result += callback(i * factor, i)
+        logger.debug("Step %d: intermediate result = %s", i, result)
+    logger.debug("Final result: %s", result)
     return result
 
 
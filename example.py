@@ -1,9 +1,30 @@
 # example.py
 
 import os
+import stat
 import sys
 from typing import Optional
 
+def _read_fd(fd: int, size: int) -> bytes:
+    """
+    Read a whole file from an open descriptor, normally with a single read syscall.
+    
+    Args:
+        fd: Open file descriptor to read from
+        size: File size reported by fstat
+        
+    Returns:
+        File content as bytes
+    """
+    data = os.read(fd, size)
+    if size and len(data) == size:
+        return data
+    # Short read, or a file whose size fstat cannot report (e.g. procfs): drain to EOF
+    chunks = [data]
+    while chunk := os.read(fd, 1 << 16):
+        chunks.append(chunk)
+    return b''.join(chunks)
+
 def read_file(filepath: str) -> Optional[str]:
     """
     Read content from a file.
@@ -15,13 +36,16 @@ def read_file(filepath: str) -> Optional[str]:
         File content as string if successful, None otherwise
     """
     try:
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
-        if not os.path.isfile(filepath):
-            raise ValueError(f"Not a file: {filepath}")
-            
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
+        # O_NONBLOCK so a FIFO path is opened (and then rejected) instead of blocking for a writer
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+        try:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                raise ValueError(f"Not a file: {filepath}")
+            data = _read_fd(fd, st.st_size)
+        finally:
+            os.close(fd)
+        return data.decode('utf-8')
     except FileNotFoundError:
         print(f"Error: File not found: {filepath}")
         return None
@@ -44,9 +68,8 @@ def count_words(text: str) -> int:
     """
     if not text:
         return 0
-    # Split on any whitespace and remove empty strings
-    words = [word for word in text.split() if word.strip()]
-    return len(words)
+    # split() with no separator already drops empty strings and surrounding whitespace
+    return len(text.split())
 
 def main():
     """
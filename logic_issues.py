@@ -1,14 +1,24 @@
+import operator
+
+
+def _divide(a, b):
+    if b == 0:
+        return "Error: Division by zero"  # ADDED: Error handling for zero division
+    return a / b
+
+
+# Operation name -> implementation; one dict lookup instead of an if/elif chain
+_OPERATIONS = {
+    'add': operator.sub,  # BUG: Should be operator.add
+    'subtract': operator.add,  # BUG: Should be operator.sub
+    'multiply': operator.mul,
+    'divide': _divide,
+}
+
+
 def calculate(a, b, operation):
     # Function name and parameter names are more descriptive now
-    if operation == 'add':
-        return a - b  # BUG: Should be a + b
-    elif operation == 'subtract':
-        return a + b  # BUG: Should be a - b
-    elif operation == 'multiply':
-        return a * b
-    elif operation == 'divide':
-        if b == 0:
-            return "Error: Division by zero"  # ADDED: Error handling for zero division
-        return a / b
-    else:
-        return None  # No logging or exception for invalid operation
\ No newline at end of file
+    func = _OPERATIONS.get(operation)
+    if func is None:
+        return None  # No logging or exception for invalid operation
+    return func(a, b)
\ No newline at end of file
@@ -0,0 +1,119 @@
+import mmap
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import dead_code
+
+class TestDeadCode(unittest.TestCase):
+    def test_read_file_large_file_is_mapped(self):
+        """Test files at or above the mmap threshold are read through mmap"""
+        test_content = "h\u00e9llo world\n" * (dead_code._MMAP_THRESHOLD // 8)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'large.txt')
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(test_content)
+            self.assertGreaterEqual(os.path.getsize(path), dead_code._MMAP_THRESHOLD)
+            with patch('dead_code.mmap.mmap', wraps=mmap.mmap) as mock_mmap:
+                result = dead_code.read_file(path)
+            self.assertEqual(result, test_content)
+            mock_mmap.assert_called_once()
+
+    def test_read_file_small_file(self):
+        """Test files below the mmap threshold are read without mmap"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'small.txt')
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write("Hello world\n")
+            with patch('dead_code.mmap.mmap', wraps=mmap.mmap) as mock_mmap:
+                result = dead_code.read_file(path)
+            self.assertEqual(result, "Hello world\n")
+            mock_mmap.assert_not_called()
+
+    def test_read_file_empty_file(self):
+        """Test reading an empty file returns an empty string"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'empty.txt')
+            open(path, 'wb').close()
+            self.assertEqual(dead_code.read_file(path), "")
+
+    def test_read_file_size_not_reported(self):
+        """Test a file whose fstat size is 0 (e.g. procfs) is drained to EOF"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'test.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("Hello world")
+            st = os.stat(path)
+            zero_size = os.stat_result(st[:6] + (0,) + st[7:10])
+            with patch('os.fstat', return_value=zero_size):
+                result = dead_code.read_file(path)
+            self.assertEqual(result, "Hello world")
+
+    def test_read_file_view_success(self):
+        """Test mapping a file returns its bytes"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'test.txt')
+            with open(path, 'wb') as f:
+                f.write(b"Hello world\n")
+            view = dead_code.read_file_view(path)
+            self.assertEqual(bytes(view), b"Hello world\n")
+            view.release()
+
+    def test_read_file_view_empty_file(self):
+        """Test mapping an empty file returns an empty view"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'empty.txt')
+            open(path, 'wb').close()
+            view = dead_code.read_file_view(path)
+            self.assertIsNotNone(view)
+            self.assertEqual(view.nbytes, 0)
+
+    def test_read_file_view_not_found(self):
+        """Test mapping a non-existent file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertIsNone(dead_code.read_file_view(os.path.join(tmpdir, 'missing.txt')))
+
+    def test_count_words_in_buffer(self):
+        """Test buffer word counts match bytes.split, including words across scan slices"""
+        test_cases = (
+            b"",
+            b" " * 10,
+            b"Hello world",
+            b"  Hello   world  ",
+            b"one\ttwo\nthree\rfour\x0bfive\x0csix",
+            b"abcdefghij klm",
+            b"\xc3\xa9t\xc3\xa9 caf\xc3\xa9",
+        )
+        for chunk_size in (1, 3, 4, 1 << 16):
+            with patch('dead_code._WORD_SCAN_CHUNK', chunk_size):
+                for data in test_cases:
+                    for buf in (data, bytearray(data), memoryview(data)):
+                        self.assertEqual(dead_code.count_words_in_buffer(buf), len(data.split()),
+                                         msg=f"{data!r} with chunk size {chunk_size}")
+
+    def test_get_prime_numbers(self):
+        """Test the sieve against trial division, with and without numpy"""
+        def trial_division(limit):
+            return [x for x in range(2, limit) if all(x % i for i in range(2, int(x**0.5) + 1))]
+
+        limits = (-1, 0, 1, 2, 3, 4, 5, 10, 11, 25, 49, 50, 100, 1000)
+        # Always cover the bytearray fallback; cover the numpy sieve too when numpy is installed
+        np_modules = [None] if dead_code.np is None else [dead_code.np, None]
+        for np_module in np_modules:
+            with patch('dead_code.np', np_module):
+                for limit in limits:
+                    self.assertEqual(dead_code.get_prime_numbers(limit), trial_division(limit),
+                                     msg=f"limit={limit}, numpy={np_module is not None}")
+
+    def test_fibonacci(self):
+        """Test fast-doubling fibonacci against the generated sequence"""
+        sequence = dead_code.generate_fibonacci(200)
+        for n in (0, 1, 2, 3, 10, 50, 93, 94, 199):
+            self.assertEqual(dead_code.fibonacci(n), sequence[n], msg=f"n={n}")
+
+    def test_fibonacci_negative_index(self):
+        """Test a negative index returns None"""
+        self.assertIsNone(dead_code.fibonacci(-1))
+
+if __name__ == '__main__':
+    unittest.main()
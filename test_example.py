@@ -1,45 +1,73 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 import example
 
 class TestExample(unittest.TestCase):
     def test_read_file_success(self):
         """Test reading a valid file"""
         test_content = "Hello world"
-        with patch('builtins.open', mock_open(read_data=test_content)) as mock_file:
-            result = example.read_file('test.txt')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'test.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(test_content)
+            result = example.read_file(path)
+            self.assertEqual(result, test_content)
+
+    def test_read_file_size_not_reported(self):
+        """Test reading a regular file whose fstat size is 0 (e.g. procfs)"""
+        test_content = "Hello world"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'test.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(test_content)
+            st = os.stat(path)
+            zero_size = os.stat_result(st[:6] + (0,) + st[7:10])
+            with patch('os.fstat', return_value=zero_size):
+                result = example.read_file(path)
             self.assertEqual(result, test_content)
-            mock_file.assert_called_once_with('test.txt', 'r', encoding='utf-8')
 
     def test_read_file_not_found(self):
         """Test reading a non-existent file"""
-        with patch('os.path.exists', return_value=False):
+        with patch('os.open', side_effect=FileNotFoundError):
             result = example.read_file('nonexistent.txt')
             self.assertIsNone(result)
 
+    def test_read_file_not_a_file(self):
+        """Test reading a directory instead of a file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = example.read_file(tmpdir)
+            self.assertIsNone(result)
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), "requires os.mkfifo")
+    def test_read_file_fifo(self):
+        """Test reading a FIFO is rejected without blocking"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'pipe')
+            os.mkfifo(path)
+            result = example.read_file(path)
+            self.assertIsNone(result)
+
     def test_read_file_permission_error(self):
         """Test reading a file with permission error"""
-        with patch('os.path.exists', return_value=True), \
-             patch('os.path.isfile', return_value=True), \
-             patch('builtins.open', side_effect=PermissionError):
+        with patch('os.open', side_effect=PermissionError):
             result = example.read_file('protected.txt')
             self.assertIsNone(result)
 
+    COUNT_WORDS_CASES = (
+        ("Hello world", 2),
+        ("  Hello   world  ", 2),
+        ("Hello, world!", 2),
+        ("", 0),
+        ("one two three", 3),
+        (" " * 100, 0),
+    )
+
     def test_count_words(self):
         """Test word counting with various inputs"""
-        test_cases = [
-            ("Hello world", 2),
-            ("  Hello   world  ", 2),
-            ("Hello, world!", 2),
-            ("", 0),
-            ("one two three", 3),
-            (" " * 100, 0)
-        ]
-        
-        for text, expected in test_cases:
-            with self.subTest(text=text):
-                result = example.count_words(text)
-                self.assertEqual(result, expected)
+        for text, expected in self.COUNT_WORDS_CASES:
+            self.assertEqual(example.count_words(text), expected, msg=repr(text))
 
     @patch('sys.argv', ['example.py', 'test.txt'])
     @patch('example.read_file', return_value="Hello world")